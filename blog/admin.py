@@ -1,12 +1,19 @@
 from django.contrib import admin
 
-from blog.models import Post, Tag, Comment
+from blog.models import Post, PostTag, Tag, Comment
+
+
+class PostTagInline(admin.TabularInline):
+    model = PostTag
+    fields = ('tag',)
+    extra = 1
 
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     list_display = ('title', 'author', 'created_at')
     raw_id_fields = ('author',)
+    inlines = (PostTagInline,)
     list_per_page = 15
 
     def get_queryset(self, request):
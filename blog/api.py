@@ -0,0 +1,244 @@
+import base64
+import json
+from dataclasses import asdict
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+
+from .models import Post, PostTag, Tag
+from .serializers import serialize_posts
+from .views import serialize_comment, serialize_tag
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+EXPORT_CHUNK_SIZE = 2000
+
+POST_FIELDS = (
+    'title', 'teaser_text', 'author', 'comments_amount', 'likes_amount',
+    'image_url', 'published_at', 'slug', 'post_url', 'tags',
+    'first_tag_title', 'first_tag_url',
+)
+POST_DETAIL_FIELDS = (
+    'title', 'text', 'author', 'comments', 'comments_count', 'likes_amount',
+    'image_url', 'published_at', 'slug', 'post_url', 'tags',
+)
+TAG_FIELDS = ('title', 'posts_with_tag', 'tag_url')
+EXPORT_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'slug': 'slug',
+    'published_at': 'published_at',
+    'author': 'author__username',
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+def api_error_response(error):
+    return JsonResponse({'error': str(error)}, status=400)
+
+
+def parse_fields(request, allowed_fields):
+    raw_fields = request.GET.get('fields')
+    if not raw_fields:
+        return list(allowed_fields)
+    fields = [field.strip() for field in raw_fields.split(',') if field.strip()]
+    unknown_fields = set(fields) - set(allowed_fields)
+    if unknown_fields:
+        raise ApiError(f'Unknown fields: {", ".join(sorted(unknown_fields))}')
+    return fields
+
+
+def parse_limit(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ApiError('limit must be an integer')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(position):
+    raw_cursor = json.dumps(position, cls=DjangoJSONEncoder).encode()
+    return base64.urlsafe_b64encode(raw_cursor).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ApiError('Malformed cursor')
+    if not isinstance(position, list) or len(position) != 2:
+        raise ApiError('Malformed cursor')
+    return position
+
+
+def decode_fresh_cursor(cursor):
+    published_at, post_id = decode_cursor(cursor)
+    if not isinstance(published_at, str) or not isinstance(post_id, int):
+        raise ApiError('Malformed cursor')
+    try:
+        published_at = parse_datetime(published_at)
+    except ValueError:
+        published_at = None
+    if published_at is None:
+        raise ApiError('Malformed cursor')
+    return published_at, post_id
+
+
+def decode_popular_cursor(cursor):
+    likes_count, post_id = decode_cursor(cursor)
+    if not isinstance(likes_count, int) or not isinstance(post_id, int):
+        raise ApiError('Malformed cursor')
+    return likes_count, post_id
+
+
+def pick_fields(serialized, fields):
+    return {field: serialized[field] for field in fields if field in serialized}
+
+
+def paginate_fresh(rows, cursor, limit, id_field='id'):
+    rows = rows.order_by('-published_at', f'-{id_field}')
+    if cursor:
+        published_at, post_id = decode_fresh_cursor(cursor)
+        rows = rows.filter(
+            Q(published_at__lt=published_at)
+            | Q(published_at=published_at, **{f'{id_field}__lt': post_id})
+        )
+    post_ids = list(rows.values_list(id_field, flat=True)[:limit + 1])
+    return post_ids[:limit], len(post_ids) > limit
+
+
+def paginate_popular(rows, cursor, limit):
+    if not cursor:
+        most_popular_post_ids = Post.objects.cached_most_popular_ids()
+        if limit < len(most_popular_post_ids):
+            return most_popular_post_ids[:limit], True
+    else:
+        likes_count, post_id = decode_popular_cursor(cursor)
+        rows = rows.filter(
+            Q(likes_count__lt=likes_count)
+            | Q(likes_count=likes_count, id__lt=post_id)
+        )
+    post_ids = list(rows.values_list('id', flat=True)[:limit + 1])
+    return post_ids[:limit], len(post_ids) > limit
+
+
+def get_fresh_cursor(card):
+    return [card.published_at.isoformat(), card.id]
+
+
+def get_popular_cursor(card):
+    return [card.likes_amount, card.id]
+
+
+def posts_page_response(request, paginate, get_cursor):
+    try:
+        fields = parse_fields(request, POST_FIELDS)
+        limit = parse_limit(request)
+        post_ids, has_next_page = paginate(request.GET.get('cursor'), limit)
+    except ApiError as error:
+        return api_error_response(error)
+
+    cards = serialize_posts(post_ids)
+    next_cursor = None
+    if has_next_page and cards:
+        next_cursor = encode_cursor(get_cursor(cards[-1]))
+    return JsonResponse({
+        'results': [pick_fields(asdict(card), fields) for card in cards],
+        'next_cursor': next_cursor,
+    })
+
+
+@require_GET
+def fresh_posts(request):
+    return posts_page_response(
+        request,
+        lambda cursor, limit: paginate_fresh(Post.objects.all(), cursor, limit),
+        get_fresh_cursor,
+    )
+
+
+@require_GET
+def popular_posts(request):
+    return posts_page_response(
+        request,
+        lambda cursor, limit: paginate_popular(Post.objects.popular(), cursor, limit),
+        get_popular_cursor,
+    )
+
+
+@require_GET
+def tag_posts(request, tag_title):
+    tag = get_object_or_404(Tag, title=tag_title)
+    rows = PostTag.objects.filter(tag=tag)
+    return posts_page_response(
+        request,
+        lambda cursor, limit: paginate_fresh(rows, cursor, limit, id_field='post_id'),
+        get_fresh_cursor,
+    )
+
+
+@require_GET
+def post_detail(request, slug):
+    try:
+        fields = parse_fields(request, POST_DETAIL_FIELDS)
+    except ApiError as error:
+        return api_error_response(error)
+
+    if 'text' in fields:
+        posts = Post.objects.only('id', 'text')
+    else:
+        posts = Post.objects.only('id')
+    post = get_object_or_404(posts, slug=slug)
+    (card,) = serialize_posts([post.id])
+
+    serialized_post = {**asdict(card), 'comments_count': card.comments_amount}
+    if 'text' in fields:
+        serialized_post['text'] = post.text
+    if 'comments' in fields:
+        serialized_post['comments'] = [
+            serialize_comment(comment)
+            for comment in post.comments.select_related('author')
+        ]
+    return JsonResponse(pick_fields(serialized_post, fields))
+
+
+@require_GET
+def tags_list(request):
+    try:
+        fields = parse_fields(request, TAG_FIELDS)
+    except ApiError as error:
+        return api_error_response(error)
+
+    tags = Tag.objects.cached_with_post_count()
+    return JsonResponse({
+        'results': [pick_fields(serialize_tag(tag), fields) for tag in tags],
+    })
+
+
+def stream_posts_ndjson(columns, fields):
+    rows = Post.objects.order_by('id').values_list(*columns)
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        line = json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder)
+        yield f'{line}\n'
+
+
+@require_GET
+def export_posts(request):
+    try:
+        fields = parse_fields(request, tuple(EXPORT_FIELDS))
+    except ApiError as error:
+        return api_error_response(error)
+
+    columns = [EXPORT_FIELDS[field] for field in fields]
+    return StreamingHttpResponse(
+        stream_posts_ndjson(columns, fields),
+        content_type='application/x-ndjson',
+    )
@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BlogConfig(AppConfig):
     name = 'blog'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if settings.WARM_CACHE_ON_STARTUP:
+            from .warmup import warm_cache_in_background
+            warm_cache_in_background()
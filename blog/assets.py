@@ -0,0 +1,81 @@
+import posixpath
+import re
+
+CSS_BUNDLE = 'bundles/site.css'
+JS_BUNDLE = 'bundles/site.js'
+
+BUNDLES = {
+    CSS_BUNDLE: [
+        'vendors/bootstrap/bootstrap.min.css',
+        'vendors/fontawesome/css/all.min.css',
+        'vendors/themify-icons/themify-icons.css',
+        'vendors/linericon/style.css',
+        'vendors/owl-carousel/owl.theme.default.min.css',
+        'vendors/owl-carousel/owl.carousel.min.css',
+        'css/style.css',
+    ],
+    JS_BUNDLE: [
+        'vendors/jquery/jquery-3.2.1.min.js',
+        'vendors/bootstrap/bootstrap.bundle.min.js',
+        'vendors/owl-carousel/owl.carousel.min.js',
+        'js/jquery.ajaxchimp.min.js',
+        'js/mail-script.js',
+        'js/main.js',
+    ],
+}
+
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+CSS_IMPORT_RE = re.compile(r'@import\s+[^;]+;')
+CSS_CHARSET_RE = re.compile(r'@charset\s+[^;]+;')
+CSS_SPACES_RE = re.compile(r'\s+')
+CSS_PUNCTUATION_RE = re.compile(r'\s*([{};,>])\s*')
+JS_LINE_COMMENT_RE = re.compile(r'^\s*//.*$', re.MULTILINE)
+
+
+def rebase_css_urls(css, source_path, bundle_path):
+    source_dir = posixpath.dirname(source_path)
+    bundle_dir = posixpath.dirname(bundle_path)
+
+    def rebase(match):
+        quote, url = match.groups()
+        if url.startswith(('/', '#', 'data:', 'http:', 'https:')) or '//' in url:
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(source_dir, url))
+        return f'url({quote}{posixpath.relpath(target, bundle_dir)}{quote})'
+
+    return CSS_URL_RE.sub(rebase, css)
+
+
+def minify_css(css):
+    css = CSS_COMMENT_RE.sub('', css)
+    css = CSS_SPACES_RE.sub(' ', css)
+    return CSS_PUNCTUATION_RE.sub(r'\1', css).strip()
+
+
+def build_css_bundle(bundle_path, sources):
+    imports = []
+    rules = []
+    for source_path, css in sources:
+        css = CSS_COMMENT_RE.sub('', css)
+        css = CSS_CHARSET_RE.sub('', css)
+        imports.extend(CSS_IMPORT_RE.findall(css))
+        css = CSS_IMPORT_RE.sub('', css)
+        rules.append(rebase_css_urls(css, source_path, bundle_path))
+    return minify_css('\n'.join(['@charset "UTF-8";', *imports, *rules]))
+
+
+def minify_js(js):
+    js = JS_LINE_COMMENT_RE.sub('', js)
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def build_js_bundle(bundle_path, sources):
+    return ';\n'.join(minify_js(js) for _, js in sources) + ';\n'
+
+
+def build_bundle(bundle_path, sources):
+    if bundle_path.endswith('.css'):
+        return build_css_bundle(bundle_path, sources)
+    return build_js_bundle(bundle_path, sources)
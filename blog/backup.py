@@ -0,0 +1,58 @@
+import gzip
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Post, PostTag, Tag
+
+BACKUP_MODELS = {
+    'user': (User, (
+        'id', 'username', 'password', 'first_name', 'last_name', 'email',
+        'is_staff', 'is_active', 'is_superuser', 'date_joined', 'last_login',
+    )),
+    'tag': (Tag, ('id', 'title', 'updated_at')),
+    'post': (Post, (
+        'id', 'title', 'text', 'slug', 'image', 'published_at', 'created_at',
+        'updated_at', 'activity_at', 'author_id',
+    )),
+    'post_tag': (PostTag, ('id', 'post_id', 'tag_id', 'published_at')),
+    'like': (Post.likes.through, ('id', 'post_id', 'user_id')),
+    'comment': (Comment, (
+        'id', 'post_id', 'author_id', 'text', 'published_at', 'created_at',
+    )),
+}
+
+
+class BackupJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder cuts datetimes to milliseconds.
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def open_backup(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, f'{mode}t', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+@contextmanager
+def preserve_auto_timestamps(models):
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    flags = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flags:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
@@ -0,0 +1,156 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_GET
+
+from .models import Post, Tag
+
+FEED_SIZE = 20
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_absolute_url(path):
+    return settings.SITE_URL.rstrip('/') + path
+
+
+class LatestPostsFeed(Feed):
+    title = 'Sensive blog'
+    description = 'Свежие посты блога'
+    feed_format = 'rss'
+
+    def link(self):
+        return get_absolute_url(reverse('index'))
+
+    def feed_url(self):
+        return get_absolute_url(reverse('posts_feed', args=[self.feed_format]))
+
+    def items(self):
+        return Post.objects.fresh().select_related('author')[:FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_link(self, item):
+        return get_absolute_url(item.get_absolute_url())
+
+    def item_description(self, item):
+        return item.text[:200]
+
+    def item_pubdate(self, item):
+        return item.published_at
+
+    def item_author_name(self, item):
+        return item.author.username
+
+
+class TagPostsFeed(LatestPostsFeed):
+    def get_object(self, request, tag_title):
+        return Tag.objects.get(title=tag_title)
+
+    def title(self, tag):
+        return f'Sensive blog: #{tag.title}'
+
+    def description(self, tag):
+        return f'Свежие посты с тегом {tag.title}'
+
+    def link(self, tag):
+        return get_absolute_url(tag.get_absolute_url())
+
+    def feed_url(self, tag):
+        return get_absolute_url(
+            reverse('tag_posts_feed', args=[tag.title, self.feed_format])
+        )
+
+    def items(self, tag):
+        return tag.posts.fresh().select_related('author')[:FEED_SIZE]
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    feed_format = 'atom'
+    subtitle = LatestPostsFeed.description
+
+
+class TagPostsAtomFeed(TagPostsFeed):
+    feed_type = Atom1Feed
+    feed_format = 'atom'
+
+    def subtitle(self, tag):
+        return self.description(tag)
+
+
+POSTS_FEEDS = {
+    'rss': LatestPostsFeed(),
+    'atom': LatestPostsAtomFeed(),
+}
+
+TAG_POSTS_FEEDS = {
+    'rss': TagPostsFeed(),
+    'atom': TagPostsAtomFeed(),
+}
+
+
+def get_feed_cache_key(feed_format, tag_title=None):
+    if tag_title is None:
+        return f'feed:{feed_format}'
+    return f'feed:{feed_format}:{tag_title}'
+
+
+def invalidate_feeds(tag_titles=()):
+    cache_keys = []
+    for feed_format in POSTS_FEEDS:
+        cache_keys.append(get_feed_cache_key(feed_format))
+        for tag_title in tag_titles:
+            cache_keys.append(get_feed_cache_key(feed_format, tag_title))
+    cache.delete_many(cache_keys)
+
+
+def build_snapshot(response):
+    content = response.content
+    return {
+        'content': content,
+        'content_type': response['Content-Type'],
+        'etag': quote_etag(hashlib.md5(content).hexdigest()),
+        'last_modified': int(time.time()),
+    }
+
+
+def serve_feed(request, feed, cache_key, *args):
+    snapshot = cache.get(cache_key)
+    if snapshot is None:
+        snapshot = build_snapshot(feed(request, *args))
+        cache.set(cache_key, snapshot, FEED_CACHE_TIMEOUT)
+
+    response = HttpResponse(snapshot['content'], content_type=snapshot['content_type'])
+    response['ETag'] = snapshot['etag']
+    response['Last-Modified'] = http_date(snapshot['last_modified'])
+    return get_conditional_response(
+        request,
+        etag=snapshot['etag'],
+        last_modified=snapshot['last_modified'],
+        response=response,
+    )
+
+
+@require_GET
+def posts_feed(request, feed_format):
+    if feed_format not in POSTS_FEEDS:
+        raise Http404('Unknown feed format')
+    cache_key = get_feed_cache_key(feed_format)
+    return serve_feed(request, POSTS_FEEDS[feed_format], cache_key)
+
+
+@require_GET
+def tag_posts_feed(request, tag_title, feed_format):
+    if feed_format not in TAG_POSTS_FEEDS:
+        raise Http404('Unknown feed format')
+    cache_key = get_feed_cache_key(feed_format, tag_title)
+    return serve_feed(request, TAG_POSTS_FEEDS[feed_format], cache_key, tag_title)
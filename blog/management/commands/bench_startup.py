@@ -0,0 +1,40 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SCENARIOS = {
+    'manage.py check': [sys.executable, 'manage.py', 'check'],
+    'wsgi cold import': [sys.executable, '-c', 'import sensive_blog.wsgi'],
+}
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время холодного старта manage.py check и импорта WSGI-приложения'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+
+    def handle(self, *args, **options):
+        for name, command in SCENARIOS.items():
+            timings = []
+            for _ in range(options['runs']):
+                started_at = time.perf_counter()
+                subprocess.run(
+                    command,
+                    cwd=settings.BASE_DIR,
+                    env=os.environ.copy(),
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+                timings.append((time.perf_counter() - started_at) * 1000)
+
+            self.stdout.write(
+                f'{name}: медиана {statistics.median(timings):.0f} мс, '
+                f'минимум {min(timings):.0f} мс, максимум {max(timings):.0f} мс'
+            )
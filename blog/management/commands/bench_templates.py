@@ -0,0 +1,87 @@
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+
+
+def get_liked_post_ids(posts):
+    return {post['id'] for post in posts[::3]}
+
+
+PAGES = {
+    'index.html': lambda posts, tags: {
+        'most_popular_posts': posts[:5],
+        'trending_posts': posts[-5:],
+        'page_posts': posts,
+        'liked_post_ids': get_liked_post_ids(posts),
+        'popular_tags': tags,
+    },
+    'post-details.html': lambda posts, tags: {
+        'post': dict(posts[0], text='lorem ipsum ' * 500, comments=[{
+            'text': f'Комментарий {number}',
+            'published_at': posts[0]['published_at'],
+            'author': 'reader',
+        } for number in range(20)]),
+        'liked_post_ids': get_liked_post_ids(posts),
+        'popular_tags': tags,
+        'most_popular_posts': posts[:5],
+    },
+    'posts-list.html': lambda posts, tags: {
+        'tag': tags[0]['title'],
+        'popular_tags': tags,
+        'posts': posts,
+        'liked_post_ids': get_liked_post_ids(posts),
+        'most_popular_posts': posts[:5],
+    },
+}
+
+
+
+def build_fixed_context(posts_count):
+    tags = [{
+        'title': f'tag{number}',
+        'posts_with_tag': 10 * number,
+        'tag_url': f'/tag/tag{number}',
+    } for number in range(5)]
+    posts = [{
+        'id': number,
+        'title': f'Пост {number}',
+        'teaser_text': 'lorem ipsum ' * 16,
+        'author': 'admin',
+        'comments_amount': number,
+        'likes_amount': number * 2,
+        'image_url': None,
+        'published_at': datetime(2024, 1, 1, tzinfo=timezone.utc),
+        'slug': f'post-{number}',
+        'post_url': f'/post/post-{number}',
+        'tags': tags[:3],
+        'first_tag_title': tags[0]['title'],
+        'first_tag_url': tags[0]['tag_url'],
+    } for number in range(posts_count)]
+    return posts, tags
+
+
+class Command(BaseCommand):
+    help = 'Рендерит страницы блога с фиксированным контекстом и замеряет скорость'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=20)
+
+    def handle(self, *args, **options):
+        posts, tags = build_fixed_context(options['posts'])
+        for template_name, build_context in PAGES.items():
+            template = get_template(template_name)
+            context = build_context(posts, tags)
+            template.render(context)
+
+            started_at = time.perf_counter()
+            for _ in range(options['iterations']):
+                template.render(context)
+            elapsed = time.perf_counter() - started_at
+
+            self.stdout.write(
+                f'{template_name}: {options["iterations"] / elapsed:.1f} renders/s '
+                f'({elapsed / options["iterations"] * 1000:.2f} ms/render)'
+            )
@@ -0,0 +1,92 @@
+import gzip
+import os
+
+import brotli
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.assets import BUNDLES, build_bundle
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.ttf', '.eot')
+MIN_COMPRESS_SIZE = 1024
+
+
+def read_static_file(path):
+    absolute_path = finders.find(path)
+    if absolute_path is None:
+        raise CommandError(f'Static file {path} not found')
+    with open(absolute_path, encoding='utf-8') as file:
+        return file.read()
+
+
+def is_fresh(compressed_path, source_path):
+    return (
+        os.path.exists(compressed_path)
+        and os.path.getmtime(compressed_path) >= os.path.getmtime(source_path)
+    )
+
+
+class Command(BaseCommand):
+    help = 'Собирает CSS и JS в бандлы, выполняет collectstatic и сжимает статику'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-collectstatic',
+            action='store_true',
+            help='Только собрать бандлы, не копируя статику в STATIC_ROOT',
+        )
+
+    def handle(self, *args, **options):
+        is_hashed = isinstance(staticfiles_storage, ManifestFilesMixin)
+        if not options['skip_collectstatic'] and not is_hashed:
+            raise CommandError(
+                'Статика без хешей в именах файлов: включите ASSET_BUNDLES_ENABLED '
+                'или запустите команду с DEBUG=False'
+            )
+
+        bundles_root = settings.STATICFILES_DIRS[0]
+        for bundle_path, source_paths in BUNDLES.items():
+            sources = [(path, read_static_file(path)) for path in source_paths]
+            content = build_bundle(bundle_path, sources)
+
+            output_path = os.path.join(bundles_root, bundle_path)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(output_path, 'w', encoding='utf-8') as file:
+                file.write(content)
+
+            original_size = sum(len(source.encode()) for _, source in sources)
+            self.stdout.write(
+                f'{bundle_path}: {len(source_paths)} файлов, '
+                f'{original_size} -> {len(content.encode())} байт'
+            )
+
+        if options['skip_collectstatic']:
+            return
+
+        call_command('collectstatic', interactive=False, verbosity=options['verbosity'])
+        compressed_count = self.compress_static_root()
+        self.stdout.write(f'Сжато файлов: {compressed_count} (gzip и brotli)')
+
+    def compress_static_root(self):
+        compressed_count = 0
+        for dirpath, _, filenames in os.walk(settings.STATIC_ROOT):
+            for filename in filenames:
+                if not filename.endswith(COMPRESSIBLE_EXTENSIONS):
+                    continue
+                path = os.path.join(dirpath, filename)
+                if os.path.getsize(path) < MIN_COMPRESS_SIZE:
+                    continue
+                with open(path, 'rb') as file:
+                    content = file.read()
+
+                if not is_fresh(f'{path}.gz', path):
+                    with open(f'{path}.gz', 'wb') as file:
+                        file.write(gzip.compress(content, compresslevel=9, mtime=0))
+                if not is_fresh(f'{path}.br', path):
+                    with open(f'{path}.br', 'wb') as file:
+                        file.write(brotli.compress(content))
+                compressed_count += 1
+        return compressed_count
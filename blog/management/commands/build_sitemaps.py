@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+from itertools import chain
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post, Tag
+
+CHUNK_SIZE = 50000
+ITERATOR_CHUNK_SIZE = 5000
+SLUG_PLACEHOLDER = 'SITEMAP-SLUG'
+MANIFEST_FILENAME = 'manifest.json'
+INDEX_FILENAME = 'sitemap.xml'
+
+URLSET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+URLSET_FOOTER = '</urlset>\n'
+
+
+def get_url_template(view_name):
+    return settings.SITE_URL.rstrip('/') + reverse(view_name, args=[SLUG_PLACEHOLDER])
+
+
+def iter_post_urls(posts):
+    url_template = get_url_template('post_detail')
+    rows = posts.order_by('id').values_list('id', 'slug', 'published_at')
+    for post_id, slug, published_at in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        url = url_template.replace(SLUG_PLACEHOLDER, slug)
+        yield post_id, url, published_at.date().isoformat()
+
+
+def iter_tag_urls(tags):
+    url_template = get_url_template('tag_filter')
+    rows = tags.order_by('id').values_list('id', 'title')
+    for tag_id, title in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield tag_id, url_template.replace(SLUG_PLACEHOLDER, title), None
+
+
+def format_url(url, lastmod):
+    if lastmod is None:
+        return f'  <url><loc>{escape(url)}</loc></url>\n'
+    return f'  <url><loc>{escape(url)}</loc><lastmod>{lastmod}</lastmod></url>\n'
+
+
+def get_chunk_filename(section, chunk_number):
+    return f'{section}-{chunk_number:05d}.xml'
+
+
+def write_atomically(path, lines):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.writelines(lines)
+    os.replace(tmp_path, path)
+
+
+class Command(BaseCommand):
+    help = 'Собирает sitemap.xml и перезаписывает только изменившиеся куски'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Перезаписать все куски, даже если они не изменились',
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(settings.SITEMAPS_ROOT, exist_ok=True)
+        manifest_path = os.path.join(settings.SITEMAPS_ROOT, MANIFEST_FILENAME)
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as file:
+                manifest = json.load(file)
+
+        sections = {
+            'posts': (Post.objects.all(), iter_post_urls),
+            'tags': (Tag.objects.all(), iter_tag_urls),
+        }
+        new_manifest = {}
+        rewritten = 0
+        for section, (queryset, iter_urls) in sections.items():
+            digests = self.get_chunk_digests(iter_urls(queryset))
+            for chunk_number, digest in digests.items():
+                filename = get_chunk_filename(section, chunk_number)
+                entry = manifest.get(filename)
+                if entry and entry['digest'] == digest and not options['force']:
+                    new_manifest[filename] = entry
+                    continue
+
+                first_id = chunk_number * CHUNK_SIZE
+                chunk = queryset.filter(id__gte=first_id, id__lt=first_id + CHUNK_SIZE)
+                lines = (format_url(url, lastmod) for _, url, lastmod in iter_urls(chunk))
+                path = os.path.join(settings.SITEMAPS_ROOT, filename)
+                write_atomically(path, chain([URLSET_HEADER], lines, [URLSET_FOOTER]))
+                new_manifest[filename] = {
+                    'digest': digest,
+                    'lastmod': timezone.now().date().isoformat(),
+                }
+                rewritten += 1
+
+        removed_filenames = manifest.keys() - new_manifest.keys()
+        for filename in removed_filenames:
+            path = os.path.join(settings.SITEMAPS_ROOT, filename)
+            if os.path.exists(path):
+                os.remove(path)
+
+        if new_manifest != manifest or options['force']:
+            self.write_index(new_manifest)
+            with open(manifest_path, 'w', encoding='utf-8') as file:
+                json.dump(new_manifest, file, indent=2, sort_keys=True)
+
+        self.stdout.write(
+            f'Кусков: {len(new_manifest)}, перезаписано: {rewritten}, '
+            f'удалено: {len(removed_filenames)}'
+        )
+
+    def get_chunk_digests(self, urls):
+        hashers = {}
+        for object_id, url, lastmod in urls:
+            chunk_number = object_id // CHUNK_SIZE
+            if chunk_number not in hashers:
+                hashers[chunk_number] = hashlib.sha1()
+            hashers[chunk_number].update(format_url(url, lastmod).encode())
+        return {
+            chunk_number: hasher.hexdigest()
+            for chunk_number, hasher in hashers.items()
+        }
+
+    def write_index(self, manifest):
+        sitemaps_url = settings.SITE_URL.rstrip('/') + settings.SITEMAPS_URL
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n',
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+        ]
+        for filename, entry in sorted(manifest.items()):
+            lines.append(
+                f'  <sitemap><loc>{escape(sitemaps_url + filename)}</loc>'
+                f'<lastmod>{entry["lastmod"]}</lastmod></sitemap>\n'
+            )
+        lines.append('</sitemapindex>\n')
+        write_atomically(os.path.join(settings.SITEMAPS_ROOT, INDEX_FILENAME), lines)
@@ -0,0 +1,37 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.backup import BACKUP_MODELS, BackupJSONEncoder, open_backup
+
+ITERATOR_CHUNK_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты, теги, комментарии и лайки в NDJSON, сжатый gzip для файлов .gz'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+
+    def handle(self, *args, **options):
+        encoder = BackupJSONEncoder(ensure_ascii=False)
+        started_at = time.perf_counter()
+        total_rows = 0
+        with open_backup(options['path'], 'w') as file:
+            for name, (model, fields) in BACKUP_MODELS.items():
+                rows = model.objects.order_by('id').values_list(*fields)
+                count = 0
+                for row in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+                    record = {'model': name, 'fields': dict(zip(fields, row))}
+                    file.write(encoder.encode(record))
+                    file.write('\n')
+                    count += 1
+                total_rows += count
+                self.stdout.write(f'{name}: {count}')
+
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            f'Выгружено {total_rows} строк за {elapsed:.1f} с '
+            f'({total_rows / max(elapsed, 1e-9):.0f} строк/с)'
+        )
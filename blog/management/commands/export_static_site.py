@@ -0,0 +1,119 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog.models import Post, Tag
+from blog.static_export import init_worker, render_page
+
+STATE_FILENAME = '.export-state.json'
+
+
+class Command(BaseCommand):
+    help = 'Рендерит главную, страницы постов и тегов в HTML-файлы для nginx'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.STATIC_SITE_ROOT)
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument(
+            '--changed',
+            action='store_true',
+            help='Перерисовать только страницы, затронутые с прошлого экспорта',
+        )
+
+    def handle(self, *args, **options):
+        output_root = options['output']
+        state_path = os.path.join(output_root, STATE_FILENAME)
+        started_at = timezone.now()
+
+        since = None
+        if options['changed'] and os.path.exists(state_path):
+            with open(state_path, encoding='utf-8') as file:
+                since = parse_datetime(json.load(file)['exported_at'])
+
+        removed_count = self.remove_stale_pages(output_root)
+        if since is None or removed_count:
+            # Sidebars on any page may link to a removed post or tag page.
+            paths = self.get_all_paths()
+        else:
+            paths = self.get_changed_paths(since)
+
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=options['workers'],
+            initializer=init_worker,
+        ) as executor:
+            results = list(executor.map(
+                render_page,
+                [(output_root, path) for path in paths],
+                chunksize=max(1, len(paths) // (options['workers'] * 4)),
+            ))
+
+        os.makedirs(output_root, exist_ok=True)
+        with open(state_path, 'w', encoding='utf-8') as file:
+            json.dump({'exported_at': started_at.isoformat()}, file)
+
+        written_count = sum(written for _, written in results)
+        elapsed = (timezone.now() - started_at).total_seconds()
+        self.stdout.write(
+            f'Отрисовано страниц: {len(results)}, записано: {written_count}, '
+            f'удалено: {removed_count}, за {elapsed:.1f} с'
+        )
+
+    def get_all_paths(self):
+        paths = [reverse('index'), reverse('contacts')]
+        paths.extend(
+            reverse('post_detail', args=[slug])
+            for slug in Post.objects.values_list('slug', flat=True)
+        )
+        paths.extend(
+            reverse('tag_filter', args=[title])
+            for title in Tag.objects.values_list('title', flat=True)
+        )
+        return paths
+
+    def get_changed_paths(self, since):
+        changed_posts = Post.objects.filter(
+            Q(updated_at__gt=since) | Q(activity_at__gt=since)
+        )
+        changed_tags = Tag.objects.filter(
+            Q(posts__in=changed_posts) | Q(updated_at__gt=since)
+        ).distinct()
+        posts_to_render = Post.objects.filter(
+            Q(id__in=changed_posts.values('id')) | Q(tags__updated_at__gt=since)
+        ).distinct()
+
+        paths = [reverse('index')]
+        paths.extend(
+            reverse('post_detail', args=[slug])
+            for slug in posts_to_render.values_list('slug', flat=True)
+        )
+        paths.extend(
+            reverse('tag_filter', args=[title])
+            for title in changed_tags.values_list('title', flat=True)
+        )
+        return paths
+
+    def remove_stale_pages(self, output_root):
+        sections = {
+            'post': set(Post.objects.values_list('slug', flat=True)),
+            'tag': set(Tag.objects.values_list('title', flat=True)),
+        }
+        removed_count = 0
+        for section, slugs in sections.items():
+            section_root = os.path.join(output_root, section)
+            if not os.path.isdir(section_root):
+                continue
+            for filename in os.listdir(section_root):
+                slug, extension = os.path.splitext(filename)
+                if extension == '.html' and slug not in slugs:
+                    os.remove(os.path.join(section_root, filename))
+                    removed_count += 1
+        return removed_count
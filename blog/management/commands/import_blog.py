@@ -0,0 +1,109 @@
+import json
+import os
+import time
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from blog.backup import BACKUP_MODELS, open_backup, preserve_auto_timestamps
+from blog.models import PostTag
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает выгрузку export_blog пачками через bulk_create. '
+        'Прерванную загрузку можно продолжить, запустив команду ещё раз'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать с первой строки, не глядя на сохранённый прогресс',
+        )
+
+    def handle(self, *args, **options):
+        self.checkpoint_path = f'{options["path"]}.progress'
+        self.started_at = time.perf_counter()
+        self.counts = {}
+        self.skipped_count = 0
+
+        done_lines = 0
+        if os.path.exists(self.checkpoint_path) and not options['restart']:
+            with open(self.checkpoint_path, encoding='utf-8') as file:
+                done_lines = int(file.read())
+            self.stdout.write(f'Продолжаю со строки {done_lines + 1}')
+
+        models = [model for model, _ in BACKUP_MODELS.values()]
+        batch_name = None
+        batch = []
+        line_number = done_lines
+        with preserve_auto_timestamps(models), open_backup(options['path'], 'r') as file:
+            for line_number, line in enumerate(file, start=1):
+                if line_number <= done_lines:
+                    continue
+                record = json.loads(line)
+                if record['model'] not in BACKUP_MODELS:
+                    raise CommandError(f'Строка {line_number}: неизвестная модель {record["model"]}')
+
+                if batch and (record['model'] != batch_name or len(batch) >= options['batch_size']):
+                    self.flush(batch_name, batch, line_number - 1)
+                    batch = []
+                batch_name = record['model']
+                model, _ = BACKUP_MODELS[batch_name]
+                batch.append(model(**record['fields']))
+
+            if batch:
+                self.flush(batch_name, batch, line_number)
+
+        self.rebuild(models)
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+        total_rows = sum(self.counts.values())
+        elapsed = time.perf_counter() - self.started_at
+        self.stdout.write(
+            f'Загружено {total_rows} строк за {elapsed:.1f} с '
+            f'({total_rows / max(elapsed, 1e-9):.0f} строк/с)'
+        )
+        if self.skipped_count:
+            self.stdout.write(f'Пропущено строк, которые уже были в базе: {self.skipped_count}')
+
+    def flush(self, name, batch, line_number):
+        model, _ = BACKUP_MODELS[name]
+        batch_ids = [instance.pk for instance in batch]
+        with transaction.atomic():
+            existing_count = model.objects.filter(pk__in=batch_ids).count()
+            model.objects.bulk_create(batch, ignore_conflicts=True)
+            imported_ids = set(model.objects.filter(pk__in=batch_ids).values_list('pk', flat=True))
+            conflicting_ids = [pk for pk in batch_ids if pk not in imported_ids]
+            if conflicting_ids:
+                raise CommandError(
+                    f'{name}: {len(conflicting_ids)} строк конфликтуют с записями в базе '
+                    f'по другим уникальным полям, например id {conflicting_ids[:5]}. '
+                    f'Загружайте выгрузку в пустую базу'
+                )
+        with open(self.checkpoint_path, 'w', encoding='utf-8') as file:
+            file.write(str(line_number))
+
+        self.counts[name] = self.counts.get(name, 0) + len(batch) - existing_count
+        self.skipped_count += existing_count
+        elapsed = time.perf_counter() - self.started_at
+        self.stdout.write(
+            f'{name}: {self.counts[name]}, '
+            f'{sum(self.counts.values()) / max(elapsed, 1e-9):.0f} строк/с'
+        )
+
+    def rebuild(self, models):
+        PostTag.objects.filter(published_at__isnull=True).sync_published_at()
+        call_command('update_trending', all=True, stdout=self.stdout)
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+        cache.clear()
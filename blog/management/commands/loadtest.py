@@ -0,0 +1,260 @@
+import itertools
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.models import Comment, Post, Tag
+
+DEFAULT_MIX = 'index=4,post=10,tag=4,like=1,comment=1'
+PERCENTILES = (50, 90, 95, 99)
+READ_SCENARIOS = ('index', 'post', 'tag')
+WRITE_SCENARIOS = ('like', 'comment')
+
+
+def parse_mix(raw_mix):
+    mix = {}
+    for item in raw_mix.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in READ_SCENARIOS + WRITE_SCENARIOS:
+            raise CommandError(f'Неизвестный сценарий: {name}')
+        try:
+            mix[name] = int(weight)
+        except ValueError:
+            raise CommandError(f'Вес сценария {name} должен быть целым числом')
+    if not any(mix.values()):
+        raise CommandError('Все веса сценариев нулевые')
+    return mix
+
+
+def get_percentile(sorted_timings, percentile):
+    index = round(percentile / 100 * (len(sorted_timings) - 1))
+    return sorted_timings[index]
+
+
+def summarize(timings, failures, elapsed):
+    summary = {
+        'requests': len(timings),
+        'errors': failures.total(),
+        'throughput_rps': round(len(timings) / elapsed, 1) if elapsed else None,
+    }
+    if failures:
+        summary['error_reasons'] = dict(failures.most_common())
+    if timings:
+        timings = sorted(timings)
+        summary['latency_ms'] = {
+            f'p{percentile}': round(get_percentile(timings, percentile), 2)
+            for percentile in PERCENTILES
+        }
+        summary['latency_ms']['max'] = round(timings[-1], 2)
+    return summary
+
+
+class WsgiTarget:
+    name = 'wsgi'
+
+    def __init__(self, host):
+        self.host = host
+        self.local = threading.local()
+
+    def get(self, path):
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client(SERVER_NAME=self.host)
+        return self.local.client.get(path).status_code
+
+
+class HttpTarget:
+    name = 'http'
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def get(self, path):
+        try:
+            with urllib.request.urlopen(self.base_url + path) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+
+class Command(BaseCommand):
+    help = 'Нагружает сайт смесью чтений и записей и выводит задержки и пропускную способность в JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument(
+            '--mix',
+            default=DEFAULT_MIX,
+            help='Веса сценариев через запятую: index, post, tag, like, comment',
+        )
+        parser.add_argument(
+            '--url',
+            help='Адрес запущенного сайта, например http://127.0.0.1:8000. '
+                 'Без него запросы идут в WSGI-приложение внутри процесса',
+        )
+        parser.add_argument('--host', default='localhost', help='Host для запросов внутри процесса')
+        parser.add_argument('--seed', type=int)
+        parser.add_argument(
+            '--allow-debug',
+            action='store_true',
+            help='Запустить внутри процесса, даже если включены DEBUG или DEBUG_TOOLBAR',
+        )
+        parser.add_argument(
+            '--keep-writes',
+            action='store_true',
+            help='Не удалять лайки и комментарии, созданные во время прогона',
+        )
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options['mix'])
+        profile = {
+            'DEBUG': settings.DEBUG,
+            'DEBUG_TOOLBAR': settings.DEBUG_TOOLBAR,
+            'NPLUSONE_SAMPLE_RATE': settings.NPLUSONE_SAMPLE_RATE,
+        }
+        if not options['url']:
+            self.check_profile(profile, options['allow_debug'])
+        self.random = random.Random(options['seed'])
+        self.post_slugs = list(Post.objects.values_list('slug', flat=True))
+        self.tag_titles = list(Tag.objects.values_list('title', flat=True))
+        self.post_ids = list(Post.objects.values_list('id', flat=True))
+        self.user_ids = list(User.objects.values_list('id', flat=True))
+        if not self.post_slugs:
+            raise CommandError('В базе нет постов')
+        if (mix.get('like') or mix.get('comment')) and not self.user_ids:
+            raise CommandError('Для лайков и комментариев в базе нужны пользователи')
+
+        if options['url']:
+            self.target = HttpTarget(options['url'])
+            allowed_hosts = nullcontext()
+        else:
+            self.target = WsgiTarget(options['host'])
+            # The host is only a label for in-process requests, so it must not
+            # be rejected when ALLOWED_HOSTS lists the production domain.
+            allowed_hosts = override_settings(ALLOWED_HOSTS=[options['host']])
+        self.created_like_ids = []
+        self.created_comment_ids = []
+        self.lock = threading.Lock()
+
+        scenarios = self.random.choices(
+            list(mix), weights=list(mix.values()), k=options['requests'],
+        )
+        timings = {name: [] for name in mix}
+        failures = {name: Counter() for name in mix}
+        next_index = itertools.count()
+
+        def work():
+            try:
+                index = next(next_index)
+                while index < len(scenarios):
+                    name = scenarios[index]
+                    started_at = time.perf_counter()
+                    try:
+                        failure = getattr(self, f'run_{name}')()
+                    except Exception as error:
+                        failure = f'{type(error).__name__}: {error}'
+                    timings[name].append((time.perf_counter() - started_at) * 1000)
+                    if failure:
+                        with self.lock:
+                            failures[name][failure] += 1
+                    index = next(next_index)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=work) for _ in range(options['concurrency'])]
+        started_at = time.perf_counter()
+        with allowed_hosts:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        elapsed = time.perf_counter() - started_at
+
+        if not options['keep_writes']:
+            self.remove_writes()
+
+        all_timings = [timing for name in mix for timing in timings[name]]
+        report = {
+            'target': options['url'] or self.target.name,
+            'concurrency': options['concurrency'],
+            'settings': None if options['url'] else profile,
+            'duration_s': round(elapsed, 3),
+            **summarize(all_timings, sum(failures.values(), Counter()), elapsed),
+            'scenarios': {
+                name: summarize(timings[name], failures[name], elapsed)
+                for name in mix
+            },
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def check_profile(self, profile, allow_debug):
+        enabled = [name for name in ('DEBUG', 'DEBUG_TOOLBAR') if profile[name]]
+        if enabled and not allow_debug:
+            raise CommandError(
+                f'Включены {", ".join(enabled)}: отладочные панели и проверки искажают '
+                'замеры. Запустите с DEBUG=False DEBUG_TOOLBAR=False или добавьте --allow-debug'
+            )
+        if profile['NPLUSONE_SAMPLE_RATE']:
+            self.stderr.write(
+                f'Проверка N+1 включена для доли запросов {profile["NPLUSONE_SAMPLE_RATE"]}, '
+                'задержки будут выше, чем без неё. Отключить: NPLUSONE_SAMPLE_RATE=0'
+            )
+
+    def pick(self, values):
+        with self.lock:
+            return self.random.choice(values)
+
+    def fetch(self, path):
+        status_code = self.target.get(path)
+        if status_code != 200:
+            return f'HTTP {status_code}'
+
+    def run_index(self):
+        return self.fetch(reverse('index'))
+
+    def run_post(self):
+        slug = self.pick(self.post_slugs)
+        return self.fetch(reverse('post_detail', args=[slug]))
+
+    def run_tag(self):
+        if not self.tag_titles:
+            return self.run_index()
+        title = self.pick(self.tag_titles)
+        return self.fetch(reverse('tag_filter', args=[title]))
+
+    def run_like(self):
+        post = Post(id=self.pick(self.post_ids))
+        user_id = self.pick(self.user_ids)
+        if post.likes.filter(id=user_id).exists():
+            return
+        post.likes.add(user_id)
+        with self.lock:
+            self.created_like_ids.append((post.id, user_id))
+
+    def run_comment(self):
+        comment = Comment.objects.create(
+            post_id=self.pick(self.post_ids),
+            author_id=self.pick(self.user_ids),
+            text='Комментарий нагрузочного теста',
+        )
+        with self.lock:
+            self.created_comment_ids.append(comment.id)
+
+    def remove_writes(self):
+        for post_id, user_id in self.created_like_ids:
+            Post(id=post_id).likes.remove(user_id)
+        Comment.objects.filter(id__in=self.created_comment_ids).delete()
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post, calculate_trending_score
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг в трендах для постов с новой активностью'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересчитать рейтинг всех постов',
+        )
+
+    def handle(self, *args, **options):
+        started_at = timezone.now()
+        posts = Post.objects.all() if options['all'] else Post.objects.with_stale_trending_score()
+        post_ids = list(posts.order_by('id').values_list('id', flat=True))
+
+        for batch_start in range(0, len(post_ids), BATCH_SIZE):
+            batch_ids = post_ids[batch_start:batch_start + BATCH_SIZE]
+            batch = list(
+                Post.objects.filter(id__in=batch_ids)
+                .with_comments_and_likes_count()
+                .only('id', 'published_at')
+            )
+            for post in batch:
+                post.trending_score = calculate_trending_score(
+                    post.likes_count, post.comments_count, post.published_at
+                )
+                post.trending_updated_at = started_at
+            Post.objects.bulk_update(batch, ['trending_score', 'trending_updated_at'])
+
+        self.stdout.write(f'Пересчитан рейтинг {len(post_ids)} постов')
@@ -0,0 +1,44 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.warmup import DEFAULT_TOP, clear_warm_keys, warm_cache
+
+
+class Command(BaseCommand):
+    help = 'Заполняет кеш популярных постов и тегов и снимки лент RSS и Atom'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=DEFAULT_TOP,
+            help='Для скольких самых популярных тегов прогреть ленты',
+        )
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересчитать ключи, даже если они уже есть в кеше',
+        )
+
+    def handle(self, *args, **options):
+        if options['force']:
+            clear_warm_keys(options['top'])
+
+        started_at = time.perf_counter()
+        timings = warm_cache(options['top'], options['workers'])
+        elapsed = time.perf_counter() - started_at
+
+        failed_count = 0
+        for name, timing in timings.items():
+            if isinstance(timing, Exception):
+                failed_count += 1
+                self.stderr.write(f'{name}: ошибка {timing}')
+            else:
+                self.stdout.write(f'{name}: {timing:.1f} мс')
+        self.stdout.write(
+            f'Прогрето: {len(timings) - failed_count}, ошибок: {failed_count}, '
+            f'за {elapsed:.1f} с'
+        )
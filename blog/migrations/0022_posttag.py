@@ -0,0 +1,53 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_published_at(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostTag = apps.get_model('blog', 'PostTag')
+    published_at = Post.objects.filter(pk=OuterRef('post_id')).values('published_at')
+    PostTag.objects.update(published_at=Subquery(published_at))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0021_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='PostTag',
+                    fields=[
+                        ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='blog.post', verbose_name='Пост')),
+                        ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='blog.tag', verbose_name='Тег')),
+                    ],
+                    options={
+                        'verbose_name': 'тег поста',
+                        'verbose_name_plural': 'теги постов',
+                        'db_table': 'blog_post_tags',
+                        'unique_together': {('post', 'tag')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='post',
+                    name='tags',
+                    field=models.ManyToManyField(related_name='posts', through='blog.PostTag', to='blog.tag', verbose_name='Теги'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='posttag',
+            name='published_at',
+            field=models.DateTimeField(null=True, verbose_name='Дата и время публикации поста'),
+        ),
+        migrations.AddIndex(
+            model_name='posttag',
+            index=models.Index(fields=['tag', '-published_at'], name='blog_post_tag_published_idx'),
+        ),
+        migrations.RunPython(fill_published_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-19 04:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0022_posttag'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='activity_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Последний лайк или комментарий'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='trending_score',
+            field=models.FloatField(db_index=True, default=0, editable=False, verbose_name='Рейтинг в трендах'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='trending_updated_at',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Рейтинг в трендах пересчитан'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0023_post_trending'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата и время изменения'),
+        ),
+    ]
@@ -1,35 +1,117 @@
+import math
+import time
+
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.db import models
-from django.db.models import Count, Prefetch
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils import timezone
 
+MAX_CHECKED_LIKES = 5000
+
+
+def calculate_trending_score(likes_count, comments_count, published_at):
+    # Ordering by weight * exp(-age / decay_time) is the same as ordering by
+    # log(weight) + published_at / decay_time, which never goes stale, so a
+    # score only has to be recomputed when the post gets new activity.
+    decay_time = settings.TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+    weight = 1 + likes_count + settings.TRENDING_COMMENT_WEIGHT * comments_count
+    return math.log(weight) + published_at.timestamp() / decay_time
+
+
+def get_liked_post_ids_version_key(user_id):
+    return f'liked_post_ids_version:{user_id}'
+
+
+def get_liked_post_ids_version(user_id):
+    version_key = get_liked_post_ids_version_key(user_id)
+    version = cache.get(version_key)
+    if version is None:
+        # A fresh version never matches entries written before the key expired.
+        cache.add(version_key, time.time_ns(), 60 * 60 * 24)
+        version = cache.get(version_key)
+    return version
+
+
+def invalidate_liked_post_ids(user_ids):
+    for user_id in user_ids:
+        try:
+            cache.incr(get_liked_post_ids_version_key(user_id))
+        except ValueError:
+            pass
+
 
 class PostQuerySet(models.QuerySet):
     def popular(self):
-        return self.annotate(likes_count=Count('likes')).order_by('-likes_count')
+        return self.annotate(likes_count=Count('likes')).order_by('-likes_count', '-id')
 
     def fresh(self):
         return self.order_by('-published_at')
 
-    def with_comments_and_likes(self):
-        return self.annotate(
-            comments_count=Count('comments'),
-            likes_count=Count('likes')
+    def trending(self):
+        return self.order_by('-trending_score')
+
+    def with_stale_trending_score(self):
+        return self.filter(
+            models.Q(trending_updated_at__isnull=True)
+            | models.Q(activity_at__gt=models.F('trending_updated_at'))
+            | models.Q(updated_at__gt=models.F('trending_updated_at'))
+        )
+
+    def with_comments_count(self):
+        comments_count = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post')
+            .annotate(count=Count('pk')).values('count')
         )
+        return self.annotate(comments_count=Coalesce(Subquery(comments_count), 0))
 
-    def popular_with_comments_and_tags(self):
-        return self.popular().prefetch_related(
-            Prefetch('tags', queryset=Tag.objects.popular()),
-            'comments'
-        ).select_related('author')
+    def with_comments_and_likes_count(self):
+        likes_count = (
+            Post.likes.through.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post')
+            .annotate(count=Count('pk')).values('count')
+        )
+        return self.with_comments_count().annotate(
+            likes_count=Coalesce(Subquery(likes_count), 0)
+        )
 
-    def fresh_with_comments_and_tags(self):
-        return self.fresh().prefetch_related(
-            Prefetch('tags', queryset=Tag.objects.popular()),
-            'comments'
-        ).select_related('author')
+    def cached_most_popular_ids(self):
+        post_ids = cache.get('most_popular_post_ids')
+        if post_ids is None:
+            post_ids = list(self.popular().values_list('id', flat=True)[:5])
+            cache.set('most_popular_post_ids', post_ids, 60 * 15)
+        return post_ids
+
+    def cached_trending_ids(self):
+        post_ids = cache.get('trending_post_ids')
+        if post_ids is None:
+            post_ids = list(self.trending().values_list('id', flat=True)[:5])
+            cache.set('trending_post_ids', post_ids, 60 * 5)
+        return post_ids
+
+    def cached_liked_ids(self, user_id, post_ids):
+        post_ids = frozenset(post_ids)
+        # Likes change the version, so a result computed before the change is
+        # written under the old version and never read again.
+        version = get_liked_post_ids_version(user_id)
+        cache_key = f'liked_post_ids:{user_id}'
+        checked_ids, liked_ids = cache.get(cache_key, (frozenset(), frozenset()), version=version)
+        if len(checked_ids | post_ids) > MAX_CHECKED_LIKES:
+            checked_ids, liked_ids = frozenset(), frozenset()
+        unchecked_ids = post_ids - checked_ids
+        if unchecked_ids:
+            newly_liked_ids = Post.likes.through.objects.filter(
+                user_id=user_id,
+                post_id__in=unchecked_ids,
+            ).values_list('post_id', flat=True)
+            checked_ids = checked_ids | unchecked_ids
+            liked_ids = liked_ids.union(newly_liked_ids)
+            cache.set(cache_key, (checked_ids, liked_ids), 60 * 15, version=version)
+        return liked_ids.intersection(post_ids)
 
 
 class TagQuerySet(models.QuerySet):
@@ -46,6 +128,35 @@ class TagQuerySet(models.QuerySet):
             cache.set('tags_with_post_count', tags, 60 * 15)
         return tags
 
+    def cached_popular(self):
+        popular_tags = cache.get('popular_tags')
+        if popular_tags is None:
+            popular_tags = list(self.popular()[:5])
+            cache.set('popular_tags', popular_tags, 60 * 15)
+        return popular_tags
+
+
+class PostTagQuerySet(models.QuerySet):
+    def latest_post_ids(self, tag, limit):
+        return list(
+            self.filter(tag=tag)
+            .order_by('-published_at', '-post_id')
+            .values_list('post_id', flat=True)[:limit]
+        )
+
+    def count_posts_by_tag(self, tag_ids):
+        counts = (
+            self.filter(tag_id__in=tag_ids)
+            .order_by().values('tag_id')
+            .annotate(posts_count=Count('post_id'))
+            .values_list('tag_id', 'posts_count')
+        )
+        return dict(counts)
+
+    def sync_published_at(self):
+        published_at = Post.objects.filter(pk=OuterRef('post_id')).values('published_at')
+        return self.update(published_at=Subquery(published_at))
+
 
 class Post(models.Model):
     id = models.BigAutoField(primary_key=True)
@@ -55,6 +166,10 @@ class Post(models.Model):
     image = models.ImageField('Картинка', null=True, blank=True)
     published_at = models.DateTimeField('Дата и время публикации')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField('Дата и время изменения', auto_now=True, db_index=True)
+    activity_at = models.DateTimeField('Последний лайк или комментарий', null=True, blank=True)
+    trending_score = models.FloatField('Рейтинг в трендах', default=0, db_index=True, editable=False)
+    trending_updated_at = models.DateTimeField('Рейтинг в трендах пересчитан', null=True, editable=False)
 
     author = models.ForeignKey(
         User,
@@ -70,6 +185,7 @@ class Post(models.Model):
 
     tags = models.ManyToManyField(
         'Tag',
+        through='PostTag',
         related_name='posts',
         verbose_name='Теги')
 
@@ -90,6 +206,7 @@ class Post(models.Model):
 class Tag(models.Model):
     id = models.BigAutoField(primary_key=True)
     title = models.CharField('Тег', max_length=20, unique=True)
+    updated_at = models.DateTimeField('Дата и время изменения', auto_now=True, db_index=True)
 
     objects = TagQuerySet.as_manager()
 
@@ -108,6 +225,38 @@ class Tag(models.Model):
         verbose_name_plural = 'теги'
 
 
+class PostTag(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    post = models.ForeignKey(
+        'Post',
+        on_delete=models.CASCADE,
+        verbose_name='Пост')
+    tag = models.ForeignKey(
+        'Tag',
+        on_delete=models.CASCADE,
+        verbose_name='Тег')
+    published_at = models.DateTimeField('Дата и время публикации поста', null=True)
+
+    objects = PostTagQuerySet.as_manager()
+
+    def __str__(self):
+        return f'{self.post} #{self.tag}'
+
+    def save(self, *args, **kwargs):
+        if self.published_at is None:
+            self.published_at = self.post.published_at
+        super().save(*args, **kwargs)
+
+    class Meta:
+        db_table = 'blog_post_tags'
+        unique_together = [('post', 'tag')]
+        indexes = [
+            models.Index(fields=['tag', '-published_at'], name='blog_post_tag_published_idx'),
+        ]
+        verbose_name = 'тег поста'
+        verbose_name_plural = 'теги постов'
+
+
 class Comment(models.Model):
     id = models.BigAutoField(primary_key=True)
     post = models.ForeignKey(
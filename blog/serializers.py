@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db.models.functions import Substr
+from django.urls import reverse
+
+from .models import Post, PostTag
+
+
+@dataclass(frozen=True, slots=True)
+class TagCard:
+    title: str
+    posts_with_tag: int
+    tag_url: str
+
+
+@dataclass(frozen=True, slots=True)
+class PostCard:
+    id: int
+    title: str
+    teaser_text: str
+    author: str
+    comments_amount: int
+    likes_amount: int
+    image_url: str | None
+    published_at: datetime
+    slug: str
+    post_url: str
+    tags: tuple
+    first_tag_title: str | None
+    first_tag_url: str | None
+
+
+def serialize_posts(post_ids):
+    post_ids = list(post_ids)
+    if not post_ids:
+        return []
+
+    rows = (
+        Post.objects.filter(id__in=post_ids)
+        .with_comments_and_likes_count()
+        .annotate(teaser_text=Substr('text', 1, 200))
+        .values_list(
+            'id', 'title', 'teaser_text', 'author__username', 'comments_count',
+            'likes_count', 'image', 'published_at', 'slug',
+        )
+    )
+
+    post_tags = list(
+        PostTag.objects.filter(post_id__in=post_ids)
+        .values_list('post_id', 'tag_id', 'tag__title')
+    )
+    posts_count = PostTag.objects.count_posts_by_tag({tag_id for _, tag_id, _ in post_tags})
+
+    tag_cards = {}
+    tags_by_post = {}
+    for post_id, tag_id, title in post_tags:
+        if tag_id not in tag_cards:
+            tag_cards[tag_id] = TagCard(
+                title=title,
+                posts_with_tag=posts_count[tag_id],
+                tag_url=reverse('tag_filter', args=[title]),
+            )
+        tags_by_post.setdefault(post_id, []).append(tag_cards[tag_id])
+
+    image_storage = Post._meta.get_field('image').storage
+    cards = {}
+    for (post_id, title, teaser_text, author, comments_count, likes_count,
+         image, published_at, slug) in rows:
+        tags = sorted(
+            tags_by_post.get(post_id, []),
+            key=lambda tag: (-tag.posts_with_tag, tag.title),
+        )
+        first_tag = tags[0] if tags else None
+        cards[post_id] = PostCard(
+            id=post_id,
+            title=title,
+            teaser_text=teaser_text,
+            author=author,
+            comments_amount=comments_count,
+            likes_amount=likes_count,
+            image_url=image_storage.url(image) if image else None,
+            published_at=published_at,
+            slug=slug,
+            post_url=reverse('post_detail', args=[slug]),
+            tags=tuple(tags),
+            first_tag_title=first_tag.title if first_tag else None,
+            first_tag_url=first_tag.tag_url if first_tag else None,
+        )
+    return [cards[post_id] for post_id in post_ids if post_id in cards]
+
+
+def serialize_post_lists(*post_id_lists):
+    post_ids = {post_id for post_id_list in post_id_lists for post_id in post_id_list}
+    cards = {card.id: card for card in serialize_posts(post_ids)}
+    return [
+        [cards[post_id] for post_id in post_id_list if post_id in cards]
+        for post_id_list in post_id_lists
+    ]
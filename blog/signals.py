@@ -0,0 +1,113 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .feeds import invalidate_feeds
+from .models import Comment, Post, PostTag, Tag, invalidate_liked_post_ids
+
+
+def get_tag_titles(post):
+    return list(post.tags.values_list('title', flat=True))
+
+
+def touch_tags(tag_ids):
+    Tag.objects.filter(id__in=tag_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Post)
+def on_post_save(sender, instance, **kwargs):
+    invalidate_feeds(get_tag_titles(instance))
+    PostTag.objects.filter(post=instance).exclude(
+        published_at=instance.published_at
+    ).update(published_at=instance.published_at)
+
+
+@receiver(pre_delete, sender=Post)
+def on_post_delete(sender, instance, **kwargs):
+    invalidate_feeds(get_tag_titles(instance))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def on_post_tags_change(sender, instance, action, pk_set, **kwargs):
+    if action not in ('pre_clear', 'post_add', 'post_remove'):
+        return
+    if isinstance(instance, Post):
+        tag_titles = get_tag_titles(instance)
+        if action == 'post_remove':
+            tag_titles += Tag.objects.filter(id__in=pk_set).values_list('title', flat=True)
+        invalidate_feeds(tag_titles)
+        if action == 'pre_clear':
+            touch_tags(instance.tags.values('id'))
+        else:
+            touch_tags(pk_set)
+        Post.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        if action == 'post_add':
+            PostTag.objects.filter(post=instance, tag_id__in=pk_set).update(
+                published_at=instance.published_at
+            )
+    else:
+        invalidate_feeds([instance.title])
+        touch_tags([instance.pk])
+        if pk_set:
+            Post.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+        if action == 'post_add':
+            PostTag.objects.filter(tag=instance, post_id__in=pk_set).sync_published_at()
+
+
+@receiver(pre_save, sender=Tag)
+def on_tag_rename(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    previous_titles = list(
+        Tag.objects.filter(pk=instance.pk).exclude(title=instance.title).values_list('title', flat=True)
+    )
+    if previous_titles:
+        invalidate_feeds(previous_titles)
+
+
+@receiver(pre_delete, sender=Tag)
+def on_tag_delete(sender, instance, **kwargs):
+    invalidate_feeds([instance.title])
+
+
+@receiver(pre_save, sender=PostTag)
+def on_post_tag_move(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    previous_tag_ids = list(PostTag.objects.filter(pk=instance.pk).values_list('tag_id', flat=True))
+    invalidate_feeds(Tag.objects.filter(id__in=previous_tag_ids).values_list('title', flat=True))
+    touch_tags(previous_tag_ids)
+
+
+@receiver(post_save, sender=PostTag)
+@receiver(post_delete, sender=PostTag)
+def on_post_tag_change(sender, instance, **kwargs):
+    invalidate_feeds(Tag.objects.filter(pk=instance.tag_id).values_list('title', flat=True))
+    touch_tags([instance.tag_id])
+    Post.objects.filter(pk=instance.post_id).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Post.likes.through)
+def on_post_likes_change(sender, instance, action, pk_set, **kwargs):
+    if action not in ('pre_clear', 'post_add', 'post_remove'):
+        return
+    if isinstance(instance, Post):
+        posts = Post.objects.filter(pk=instance.pk)
+        if action == 'pre_clear':
+            user_ids = list(instance.likes.values_list('id', flat=True))
+        else:
+            user_ids = pk_set
+    else:
+        if action == 'pre_clear':
+            posts = Post.objects.filter(likes=instance)
+        else:
+            posts = Post.objects.filter(pk__in=pk_set)
+        user_ids = [instance.pk]
+    posts.update(activity_at=timezone.now())
+    invalidate_liked_post_ids(user_ids)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def on_comment_change(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(activity_at=timezone.now())
@@ -0,0 +1,42 @@
+import os
+
+import django
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import resolve
+
+# Worker processes import this module before Django is set up when the pool
+# uses the spawn or forkserver start method, so it must not import models.
+
+
+def init_worker():
+    django.setup()
+    connections.close_all()
+
+
+def get_page_filename(path):
+    if path.endswith('/'):
+        return f'{path}index.html'
+    return f'{path}.html'
+
+
+def render_page(args):
+    output_root, path = args
+    request = RequestFactory().get(path)
+    match = resolve(path)
+    response = match.func(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        return path, False
+
+    filename = os.path.join(output_root, get_page_filename(path).lstrip('/'))
+    if os.path.exists(filename):
+        with open(filename, 'rb') as file:
+            if file.read() == response.content:
+                return path, False
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    tmp_filename = f'{filename}.tmp'
+    with open(tmp_filename, 'wb') as file:
+        file.write(response.content)
+    os.replace(tmp_filename, filename)
+    return path, True
@@ -0,0 +1,18 @@
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+
+
+class BlogManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def url_converter(self, name, hashed_files, template=None):
+        converter = super().url_converter(name, hashed_files, template)
+
+        def convert_or_keep(matchobj):
+            # Theme stylesheets reference fonts, source maps and images that
+            # are not shipped or lie outside the static root, keep such
+            # references as they are.
+            try:
+                return converter(matchobj)
+            except (ValueError, SuspiciousFileOperation):
+                return matchobj[0]
+
+        return convert_or_keep
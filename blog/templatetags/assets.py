@@ -0,0 +1,22 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from blog.assets import BUNDLES
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle(bundle_path):
+    if settings.ASSET_BUNDLES_ENABLED:
+        paths = [bundle_path]
+    else:
+        paths = BUNDLES[bundle_path]
+
+    if bundle_path.endswith('.css'):
+        tag_template = '<link rel="stylesheet" href="{}">\n'
+    else:
+        tag_template = '<script src="{}"></script>\n'
+    return format_html_join('', tag_template, ((static(path),) for path in paths))
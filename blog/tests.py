@@ -0,0 +1,388 @@
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .backup import BACKUP_MODELS
+
+from .feeds import get_feed_cache_key
+from .management.commands.import_blog import Command as ImportBlogCommand
+from .models import Comment, Post, PostTag, Tag, calculate_trending_score
+from .nplusone import NPlusOneError, NPlusOneMiddleware, detect_n_plus_one
+from .serializers import serialize_posts
+
+
+@override_settings(NPLUSONE_RAISE=True, NPLUSONE_THRESHOLD=3)
+class NPlusOneTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create(username=f'user{number}', is_staff=number < 3)
+            for number in range(10)
+        ]
+        cls.tags = [Tag.objects.create(title=f'tag{number}') for number in range(6)]
+        now = timezone.now()
+        cls.posts = []
+        for number in range(12):
+            post = Post.objects.create(
+                title=f'Пост {number}',
+                text='lorem ipsum ' * 50,
+                slug=f'post-{number}',
+                published_at=now - timedelta(days=number),
+                author=cls.users[number % 3],
+            )
+            post.tags.add(*cls.tags[number % 4:number % 4 + 3])
+            post.likes.add(*cls.users[:number % 7])
+            for comment_number in range(number % 4):
+                Comment.objects.create(
+                    post=post,
+                    author=cls.users[comment_number],
+                    text=f'Комментарий {comment_number}',
+                )
+            cls.posts.append(post)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_urls(self):
+        post = self.posts[0]
+        tag = self.tags[0]
+        return [
+            reverse('index'),
+            reverse('post_detail', args=[post.slug]),
+            reverse('tag_filter', args=[tag.title]),
+            reverse('api_fresh_posts'),
+            reverse('api_popular_posts'),
+            reverse('api_post_detail', args=[post.slug]),
+            reverse('api_tags'),
+            reverse('api_tag_posts', args=[tag.title]),
+            reverse('posts_feed', args=['rss']),
+            reverse('posts_feed', args=['atom']),
+            reverse('tag_posts_feed', args=[tag.title, 'rss']),
+        ]
+
+    def test_pages_have_no_n_plus_one_with_cold_cache(self):
+        for url in self.get_urls():
+            with self.subTest(url=url):
+                cache.clear()
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_pages_have_no_n_plus_one_for_logged_in_user(self):
+        self.client.force_login(self.users[0])
+        for url in self.get_urls()[:3]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_api_pagination_has_no_n_plus_one(self):
+        response = self.client.get(reverse('api_fresh_posts'), {'limit': 5})
+        response = self.client.get(
+            reverse('api_fresh_posts'),
+            {'limit': 5, 'cursor': response.json()['next_cursor']},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_api_post_detail_accepts_any_slug(self):
+        for slug in ('popular', 'export'):
+            with self.subTest(slug=slug):
+                Post.objects.filter(id=self.posts[0].id).update(slug=slug)
+                response = self.client.get(reverse('api_post_detail', args=[slug]))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['slug'], slug)
+
+    def test_detector_raises_on_query_in_loop(self):
+        with self.assertRaises(NPlusOneError):
+            with detect_n_plus_one('loop'):
+                for post in Post.objects.all():
+                    post.tags.first()
+
+    def test_detector_ignores_batched_queries(self):
+        with detect_n_plus_one('batch'):
+            cards = serialize_posts([post.id for post in self.posts])
+        self.assertEqual(len(cards), len(self.posts))
+
+    def get_looping_middleware(self):
+        def get_response(request):
+            for post in Post.objects.all():
+                post.tags.first()
+            return HttpResponse()
+
+        return NPlusOneMiddleware(get_response)
+
+    @override_settings(NPLUSONE_RAISE=False, NPLUSONE_SAMPLE_RATE=1.0)
+    def test_middleware_logs_sampled_requests(self):
+        middleware = self.get_looping_middleware()
+        with self.assertLogs('blog.nplusone', 'WARNING') as logs:
+            response = middleware(RequestFactory().get('/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('N+1 queries detected in GET /', logs.output[0])
+
+    @override_settings(NPLUSONE_RAISE=False, NPLUSONE_SAMPLE_RATE=0)
+    def test_middleware_skips_unsampled_requests(self):
+        middleware = self.get_looping_middleware()
+        with self.assertNoLogs('blog.nplusone', 'WARNING'):
+            response = middleware(RequestFactory().get('/'))
+        self.assertEqual(response.status_code, 200)
+
+
+class FeedTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='author', is_staff=True)
+        cls.tag = Tag.objects.create(title='python')
+        cls.post = Post.objects.create(
+            title='Пост',
+            text='lorem ipsum',
+            slug='post',
+            published_at=timezone.now() - timedelta(days=1),
+            author=cls.author,
+        )
+        cls.post.tags.add(cls.tag)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_tag_feed(self, title=None):
+        return self.client.get(reverse('tag_posts_feed', args=[title or self.tag.title, 'rss']))
+
+    def test_feed_answers_conditional_requests(self):
+        url = reverse('posts_feed', args=['rss'])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_save_invalidates_feeds(self):
+        self.get_tag_feed()
+        self.assertIsNotNone(cache.get(get_feed_cache_key('rss', self.tag.title)))
+
+        self.post.title = 'Новый заголовок'
+        self.post.save()
+        self.assertIsNone(cache.get(get_feed_cache_key('rss')))
+        self.assertIsNone(cache.get(get_feed_cache_key('rss', self.tag.title)))
+        self.assertContains(self.get_tag_feed(), 'Новый заголовок')
+
+    def test_tag_rename_invalidates_old_feed(self):
+        self.get_tag_feed()
+        self.tag.title = 'django'
+        self.tag.save()
+        self.assertIsNone(cache.get(get_feed_cache_key('rss', 'python')))
+        self.assertEqual(self.get_tag_feed('python').status_code, 404)
+
+    def test_removing_tag_invalidates_its_feed(self):
+        self.get_tag_feed()
+        self.post.tags.remove(self.tag)
+        self.assertIsNone(cache.get(get_feed_cache_key('rss', self.tag.title)))
+
+    def test_tag_changes_touch_tag(self):
+        other_tag = Tag.objects.create(title='other')
+        updated_at = other_tag.updated_at
+        self.post.tags.add(other_tag)
+        other_tag.refresh_from_db()
+        self.assertGreater(other_tag.updated_at, updated_at)
+
+        updated_at = other_tag.updated_at
+        PostTag.objects.get(post=self.post, tag=other_tag).delete()
+        other_tag.refresh_from_db()
+        self.assertGreater(other_tag.updated_at, updated_at)
+
+    def test_post_tag_published_at_follows_post(self):
+        post_tag = PostTag.objects.get(post=self.post, tag=self.tag)
+        self.assertEqual(post_tag.published_at, self.post.published_at)
+
+        self.post.published_at = timezone.now()
+        self.post.save()
+        post_tag.refresh_from_db()
+        self.assertEqual(post_tag.published_at, self.post.published_at)
+
+        other_post = Post.objects.create(
+            title='Другой пост',
+            text='lorem ipsum',
+            slug='other-post',
+            published_at=timezone.now() - timedelta(days=3),
+            author=self.author,
+        )
+        self.tag.posts.add(other_post)
+        self.assertEqual(
+            PostTag.objects.get(post=other_post, tag=self.tag).published_at,
+            other_post.published_at,
+        )
+
+
+class SitemapTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create(username='author', is_staff=True)
+        cls.tag = Tag.objects.create(title='python')
+        cls.post = Post.objects.create(
+            title='Пост',
+            text='lorem ipsum',
+            slug='post',
+            published_at=timezone.now(),
+            author=author,
+        )
+
+    def setUp(self):
+        sitemaps_root = tempfile.TemporaryDirectory()
+        self.addCleanup(sitemaps_root.cleanup)
+        self.sitemaps_root = sitemaps_root.name
+
+    def build_sitemaps(self):
+        stdout = StringIO()
+        with self.settings(SITEMAPS_ROOT=self.sitemaps_root):
+            call_command('build_sitemaps', stdout=stdout)
+        return stdout.getvalue().strip()
+
+    def read_sitemap(self, filename):
+        with open(os.path.join(self.sitemaps_root, filename), encoding='utf-8') as file:
+            return file.read()
+
+    def test_rewrites_only_changed_chunks(self):
+        self.assertEqual(self.build_sitemaps(), 'Кусков: 2, перезаписано: 2, удалено: 0')
+        self.assertIn('posts-00000.xml', self.read_sitemap('sitemap.xml'))
+        self.assertIn('tags-00000.xml', self.read_sitemap('sitemap.xml'))
+        self.assertEqual(self.build_sitemaps(), 'Кусков: 2, перезаписано: 0, удалено: 0')
+
+        self.post.slug = 'renamed-post'
+        self.post.save()
+        self.assertEqual(self.build_sitemaps(), 'Кусков: 2, перезаписано: 1, удалено: 0')
+        self.assertIn('/post/renamed-post', self.read_sitemap('posts-00000.xml'))
+
+    def test_removes_empty_chunks(self):
+        self.build_sitemaps()
+        self.tag.delete()
+        self.assertEqual(self.build_sitemaps(), 'Кусков: 1, перезаписано: 0, удалено: 1')
+        self.assertFalse(os.path.exists(os.path.join(self.sitemaps_root, 'tags-00000.xml')))
+        self.assertNotIn('tags-00000.xml', self.read_sitemap('sitemap.xml'))
+
+
+@override_settings(TRENDING_HALF_LIFE_HOURS=48, TRENDING_COMMENT_WEIGHT=2)
+class TrendingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create(username=f'user{number}') for number in range(4)]
+        now = timezone.now()
+        cls.posts = [
+            Post.objects.create(
+                title=f'Пост {number}',
+                text='lorem ipsum',
+                slug=f'post-{number}',
+                published_at=now - timedelta(hours=48 * number),
+                author=cls.users[0],
+            )
+            for number in range(3)
+        ]
+
+    def test_score_halves_weight_every_half_life(self):
+        now = timezone.now()
+        self.assertAlmostEqual(
+            calculate_trending_score(1, 0, now - timedelta(hours=96)),
+            calculate_trending_score(0, 0, now - timedelta(hours=48)),
+        )
+        self.assertAlmostEqual(
+            calculate_trending_score(0, 1, now),
+            calculate_trending_score(2, 0, now),
+        )
+        self.assertGreater(
+            calculate_trending_score(0, 0, now),
+            calculate_trending_score(0, 0, now - timedelta(hours=1)),
+        )
+
+    def test_trending_orders_by_decayed_activity(self):
+        self.posts[1].likes.add(*self.users[:3])
+        call_command('update_trending', stdout=StringIO())
+        trending_ids = list(Post.objects.trending().values_list('id', flat=True))
+        self.assertEqual(trending_ids, [self.posts[1].id, self.posts[0].id, self.posts[2].id])
+
+    def test_only_posts_with_new_activity_are_stale(self):
+        call_command('update_trending', stdout=StringIO())
+        self.assertFalse(Post.objects.with_stale_trending_score().exists())
+
+        Comment.objects.create(post=self.posts[2], author=self.users[1], text='Комментарий')
+        self.posts[0].likes.add(self.users[1])
+        stale_ids = set(Post.objects.with_stale_trending_score().values_list('id', flat=True))
+        self.assertEqual(stale_ids, {self.posts[0].id, self.posts[2].id})
+
+        call_command('update_trending', stdout=StringIO())
+        self.assertFalse(Post.objects.with_stale_trending_score().exists())
+
+
+class BackupTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = [User.objects.create(username=f'user{number}', is_staff=True) for number in range(3)]
+        tags = [Tag.objects.create(title=f'tag{number}') for number in range(3)]
+        for number in range(5):
+            post = Post.objects.create(
+                title=f'Пост {number}',
+                text='lorem ipsum',
+                slug=f'post-{number}',
+                published_at=timezone.now() - timedelta(days=number, microseconds=number),
+                author=users[number % 3],
+            )
+            post.tags.add(*tags[:number % 3 + 1])
+            post.likes.add(*users[:number % 3])
+            Comment.objects.create(post=post, author=users[0], text=f'Комментарий {number}')
+
+    def setUp(self):
+        backup_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(backup_dir.cleanup)
+        self.path = os.path.join(backup_dir.name, 'blog.ndjson.gz')
+
+    def get_rows(self):
+        return {
+            name: list(model.objects.order_by('id').values_list(*fields))
+            for name, (model, fields) in BACKUP_MODELS.items()
+        }
+
+    def clear_blog(self):
+        Post.objects.all().delete()
+        Tag.objects.all().delete()
+        User.objects.all().delete()
+
+    def test_round_trip_keeps_all_rows(self):
+        rows = self.get_rows()
+        call_command('export_blog', self.path, stdout=StringIO())
+        self.clear_blog()
+        call_command('import_blog', self.path, stdout=StringIO())
+        self.assertEqual(self.get_rows(), rows)
+        self.assertFalse(os.path.exists(f'{self.path}.progress'))
+
+    def test_import_resumes_after_failure(self):
+        rows = self.get_rows()
+        call_command('export_blog', self.path, stdout=StringIO())
+        self.clear_blog()
+
+        flush = ImportBlogCommand.flush
+        flushed_batches = []
+
+        def fail_on_third_batch(command, *args):
+            if len(flushed_batches) == 2:
+                raise RuntimeError('Interrupted')
+            flushed_batches.append(args)
+            flush(command, *args)
+
+        with mock.patch.object(ImportBlogCommand, 'flush', fail_on_third_batch):
+            with self.assertRaises(RuntimeError):
+                call_command('import_blog', self.path, batch_size=2, stdout=StringIO())
+        self.assertTrue(os.path.exists(f'{self.path}.progress'))
+
+        stdout = StringIO()
+        call_command('import_blog', self.path, batch_size=2, stdout=stdout)
+        self.assertIn('Продолжаю со строки', stdout.getvalue())
+        self.assertEqual(self.get_rows(), rows)
@@ -1,102 +1,99 @@
-from django.core.cache import cache
+from dataclasses import asdict
+
 from django.shortcuts import render, get_object_or_404
 
-from .models import Post, Tag
+from .models import Post, PostTag, Tag
+from .serializers import serialize_post_lists
 
 
 def serialize_tag(tag):
     return {
         'title': tag.title,
         'posts_with_tag': tag.posts_with_tag,
+        'tag_url': tag.get_absolute_url(),
     }
 
 
-def serialize_post(post):
-    return {
-        'title': post.title,
-        'teaser_text': post.text[:200],
-        'author': post.author.username,
-        'comments_amount': post.comments.count(),
-        'likes_amount': post.likes_count,
-        'image_url': post.image.url if post.image else None,
-        'published_at': post.published_at,
-        'slug': post.slug,
-        'tags': [serialize_tag(tag) for tag in post.tags.all()],
-        'first_tag_title': post.tags.first().title if post.tags.exists() else None,
-    }
+def get_liked_post_ids(request, *post_lists):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return frozenset()
+    post_ids = {post.id for posts in post_lists for post in posts}
+    return Post.objects.cached_liked_ids(user.id, post_ids)
 
 
 def index(request):
-    most_popular_posts = cache.get('most_popular_posts')
-    if most_popular_posts is None:
-        posts_query = Post.objects.popular_with_comments_and_tags()
-        most_popular_posts = list(posts_query[:5])
-        cache.set('most_popular_posts', most_popular_posts, 60 * 15)
-
-    fresh_posts = (
-        Post.objects.popular_with_comments_and_tags()
-        .order_by('-published_at')[:5]
+    fresh_post_ids = list(Post.objects.fresh().values_list('id', flat=True)[:5])
+    page_posts, most_popular_posts, trending_posts = serialize_post_lists(
+        fresh_post_ids,
+        Post.objects.cached_most_popular_ids(),
+        Post.objects.cached_trending_ids(),
+    )
+    most_popular_tags = Tag.objects.cached_popular()
+    liked_post_ids = get_liked_post_ids(
+        request, page_posts, most_popular_posts, trending_posts,
     )
-
-    most_popular_tags = Tag.objects.cached_with_post_count()[:5]
 
     context = {
-        'most_popular_posts': [serialize_post(post) for post in most_popular_posts],
-        'page_posts': [serialize_post(post) for post in fresh_posts],
+        'most_popular_posts': most_popular_posts,
+        'trending_posts': trending_posts,
+        'page_posts': page_posts,
+        'liked_post_ids': liked_post_ids,
         'popular_tags': [serialize_tag(tag) for tag in most_popular_tags],
     }
     return render(request, 'index.html', context)
 
 
-def post_detail(request, slug):
-    post = get_object_or_404(
-        Post.objects.popular_with_comments_and_tags(),
-        slug=slug
-    )
-
-    serialized_comments = [{
+def serialize_comment(comment):
+    return {
         'text': comment.text,
         'published_at': comment.published_at,
         'author': comment.author.username,
-    } for comment in post.comments.select_related('author')]
+    }
 
-    most_popular_tags = Tag.objects.cached_with_post_count().order_by('-posts_with_tag')[:5]
-    most_popular_posts = cache.get('most_popular_posts')
+
+def post_detail(request, slug):
+    post = get_object_or_404(Post.objects.only('id', 'text'), slug=slug)
+    (post_card,), most_popular_posts = serialize_post_lists(
+        [post.id],
+        Post.objects.cached_most_popular_ids(),
+    )
 
     serialized_post = {
-        'title': post.title,
+        **asdict(post_card),
         'text': post.text,
-        'author': post.author.username,
-        'comments': serialized_comments,
-        'comments_count': post.comments.count(),
-        'likes_amount': post.likes_count,
-        'image_url': post.image.url if post.image else None,
-        'published_at': post.published_at,
-        'slug': post.slug,
-        'tags': [serialize_tag(tag) for tag in post.tags.all()],
+        'comments': [
+            serialize_comment(comment)
+            for comment in post.comments.select_related('author')
+        ],
     }
+    most_popular_tags = Tag.objects.cached_popular()
+    liked_post_ids = get_liked_post_ids(request, [post_card], most_popular_posts)
 
     context = {
         'post': serialized_post,
+        'liked_post_ids': liked_post_ids,
         'popular_tags': [serialize_tag(tag) for tag in most_popular_tags],
-        'most_popular_posts': [serialize_post(post) for post in most_popular_posts],
+        'most_popular_posts': most_popular_posts,
     }
     return render(request, 'post-details.html', context)
 
 
 def tag_filter(request, tag_title):
-    tag = get_object_or_404(Tag.objects.cached_with_post_count(), title=tag_title)
-
-    related_posts = tag.posts.popular_with_comments_and_tags().order_by('-published_at')[:20]
-
-    most_popular_posts = cache.get('most_popular_posts')
-    most_popular_tags = Tag.objects.cached_with_post_count().order_by('-posts_with_tag')[:5]
+    tag = get_object_or_404(Tag, title=tag_title)
+    posts, most_popular_posts = serialize_post_lists(
+        PostTag.objects.latest_post_ids(tag, 20),
+        Post.objects.cached_most_popular_ids(),
+    )
+    most_popular_tags = Tag.objects.cached_popular()
+    liked_post_ids = get_liked_post_ids(request, posts, most_popular_posts)
 
     context = {
         'tag': tag.title,
         'popular_tags': [serialize_tag(tag) for tag in most_popular_tags],
-        'posts': [serialize_post(post) for post in related_posts],
-        'most_popular_posts': [serialize_post(post) for post in most_popular_posts],
+        'posts': posts,
+        'liked_post_ids': liked_post_ids,
+        'most_popular_posts': most_popular_posts,
     }
     return render(request, 'posts-list.html', context)
 
@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from .feeds import POSTS_FEEDS, get_feed_cache_key, invalidate_feeds
+from .models import Post, Tag
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP = 20
+
+SHARED_CACHE_KEYS = {
+    'most_popular_post_ids': lambda: Post.objects.cached_most_popular_ids(),
+    'trending_post_ids': lambda: Post.objects.cached_trending_ids(),
+    'popular_tags': lambda: Tag.objects.cached_popular(),
+    'tags_with_post_count': lambda: Tag.objects.cached_with_post_count(),
+}
+
+
+def build_request(path):
+    site_url = urlsplit(settings.SITE_URL)
+    return RequestFactory().get(
+        path,
+        HTTP_HOST=site_url.netloc,
+        secure=site_url.scheme == 'https',
+    )
+
+
+def render_path(path):
+    match = resolve(path)
+    response = match.func(build_request(path), *match.args, **match.kwargs)
+    if response.status_code != 200:
+        raise ValueError(f'{path} responded with {response.status_code}')
+
+
+def get_top_tag_titles(top):
+    return list(Tag.objects.popular().values_list('title', flat=True)[:top])
+
+
+def get_feed_paths(top):
+    feed_paths = {
+        get_feed_cache_key(feed_format): reverse('posts_feed', args=[feed_format])
+        for feed_format in POSTS_FEEDS
+    }
+    for title in get_top_tag_titles(top):
+        for feed_format in POSTS_FEEDS:
+            cache_key = get_feed_cache_key(feed_format, title)
+            feed_paths[cache_key] = reverse('tag_posts_feed', args=[title, feed_format])
+    return feed_paths
+
+
+def clear_warm_keys(top=DEFAULT_TOP):
+    cache.delete_many(list(SHARED_CACHE_KEYS))
+    invalidate_feeds(get_top_tag_titles(top))
+
+
+def timed(function, *args):
+    started_at = time.perf_counter()
+    try:
+        function(*args)
+    finally:
+        connections.close_all()
+    return (time.perf_counter() - started_at) * 1000
+
+
+def run_parallel(tasks, workers):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            name: executor.submit(timed, function, *args)
+            for name, (function, *args) in tasks.items()
+        }
+    timings = {}
+    for name, future in futures.items():
+        try:
+            timings[name] = future.result()
+        except Exception as error:
+            timings[name] = error
+    return timings
+
+
+def warm_cache(top=DEFAULT_TOP, workers=4):
+    keys = {key: (function,) for key, function in SHARED_CACHE_KEYS.items()}
+    timings = run_parallel(keys, workers)
+    feeds = {
+        cache_key: (render_path, path)
+        for cache_key, path in get_feed_paths(top).items()
+    }
+    timings.update(run_parallel(feeds, workers))
+    return timings
+
+
+def warm_cache_in_background():
+    def run():
+        try:
+            timings = warm_cache()
+        except Exception:
+            logger.exception('Cache warm-up failed')
+            return
+        finally:
+            connections.close_all()
+        failed = [name for name, timing in timings.items() if isinstance(timing, Exception)]
+        if failed:
+            logger.warning('Cache warm-up failed for %s', ', '.join(failed))
+
+    threading.Thread(target=run, name='warm-cache', daemon=True).start()
@@ -1,4 +1,5 @@
 import os
+import sys
 
 from environs import Env
 
@@ -15,29 +16,61 @@ SECRET_KEY = env.str('SECRET_KEY', 'REPLACE_ME')
 
 DEBUG = env.bool('DEBUG', True)
 
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
+DEBUG_TOOLBAR = env.bool('DEBUG_TOOLBAR', DEBUG)
 
-    'blog',
-    'debug_toolbar',
-]
+READ_ONLY = env.bool('READ_ONLY', False)
 
-MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+if READ_ONLY:
+    INSTALLED_APPS = [
+        'django.contrib.auth',
+        'django.contrib.contenttypes',
+        'django.contrib.staticfiles',
 
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
-]
+        'blog',
+    ]
+
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'blog.nplusone.NPlusOneMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ]
+else:
+    INSTALLED_APPS = [
+        'django.contrib.admin',
+        'django.contrib.auth',
+        'django.contrib.contenttypes',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+
+        'blog',
+    ]
+
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'blog.nplusone.NPlusOneMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ]
+
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
+NPLUSONE_THRESHOLD = env.int('NPLUSONE_THRESHOLD', 3)
+
+NPLUSONE_RAISE = env.bool('NPLUSONE_RAISE', 'test' in sys.argv)
+
+NPLUSONE_SAMPLE_RATE = env.float('NPLUSONE_SAMPLE_RATE', 1.0 if DEBUG else 0.01)
+
+TRENDING_HALF_LIFE_HOURS = env.float('TRENDING_HALF_LIFE_HOURS', 48)
+
+TRENDING_COMMENT_WEIGHT = env.float('TRENDING_COMMENT_WEIGHT', 2)
 
 INTERNAL_IPS = [
 
@@ -51,14 +84,36 @@ TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
-STATIC_ROOT = ''
+STATIC_ROOT = env.str('STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+
+ASSET_BUNDLES_ENABLED = env.bool('ASSET_BUNDLES_ENABLED', not DEBUG)
+
+if ASSET_BUNDLES_ENABLED:
+    STORAGES = {
+        'default': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        },
+        'staticfiles': {
+            'BACKEND': 'blog.storage.BlogManifestStaticFilesStorage',
+        },
+    }
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+if not DEBUG:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATE_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -79,6 +134,12 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': env.dj_cache_url('CACHE_URL', 'locmem://'),
+}
+
+WARM_CACHE_ON_STARTUP = env.bool('WARM_CACHE_ON_STARTUP', False)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',  # noqa: E501
@@ -106,6 +167,14 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+SITE_URL = env.str('SITE_URL', 'http://127.0.0.1:8000')
+
+SITEMAPS_URL = '/sitemaps/'
+
+SITEMAPS_ROOT = env.str('SITEMAPS_ROOT', os.path.join(BASE_DIR, 'sitemaps'))
+
+STATIC_SITE_ROOT = env.str('STATIC_SITE_ROOT', os.path.join(BASE_DIR, 'static_site'))
+
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 MEDIA_URL = '/media/'
@@ -1,21 +1,34 @@
 from django.conf import settings
 from django.conf.urls import include
 from django.conf.urls.static import static
-from django.contrib import admin
 from django.urls import path
 
-from blog import views
+from blog import api, feeds, views
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    path('api/posts/', api.fresh_posts, name='api_fresh_posts'),
+    path('api/posts/popular/', api.popular_posts, name='api_popular_posts'),
+    path('api/posts/export/', api.export_posts, name='api_export_posts'),
+    path('api/post/<slug:slug>/', api.post_detail, name='api_post_detail'),
+    path('api/tags/', api.tags_list, name='api_tags'),
+    path('api/tags/<slug:tag_title>/posts/', api.tag_posts, name='api_tag_posts'),
     path('page/<int:page>', views.index, name='index'),
     path('post/<slug:slug>', views.post_detail, name='post_detail'),
     path('tag/<slug:tag_title>', views.tag_filter, name='tag_filter'),
+    path('feed/<slug:feed_format>/', feeds.posts_feed, name='posts_feed'),
+    path('tag/<slug:tag_title>/feed/<slug:feed_format>/', feeds.tag_posts_feed, name='tag_posts_feed'),
     path('contacts/', views.contacts, name='contacts'),
     path('', views.index, name='index'),
 ]
 
-if settings.DEBUG:
+if not settings.READ_ONLY:
+    from django.contrib import admin
+
+    urlpatterns = [
+                      path('admin/', admin.site.urls),
+                  ] + urlpatterns
+
+if settings.DEBUG_TOOLBAR:
     import debug_toolbar
 
     urlpatterns = [
@@ -23,3 +36,4 @@ if settings.DEBUG:
                   ] + urlpatterns
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += static(settings.SITEMAPS_URL, document_root=settings.SITEMAPS_ROOT)